@@ -407,7 +407,7 @@ class TacsSolver(om.ImplicitComponent):
             Fext = None
 
         self.sp.solve(Fext=Fext)
-        self.sp.getVariables(states=outputs[self.states_name])
+        self.sp.getVariables(states=outputs[self.states_name], readonly=True)
 
     def solve_linear(self, d_outputs, d_residuals, mode):
         if mode == "fwd":
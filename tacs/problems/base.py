@@ -489,21 +489,19 @@ class TACSProblem(BaseUI):
             nodeIDs, nastranOrdering
         )
 
-        # Flag to make sure we find all user-specified nodes
-        nodeFound = np.zeros(numNodes, dtype=int)
+        # Flag to make sure we find all user-specified nodes,
+        # nodes owned by this processor have a non-negative local ID
+        localNodeIDs = np.asarray(localNodeIDs)
+        nodeFound = (localNodeIDs >= 0).astype(int)
 
         F_array = FVec.getArray()
         nnodes = self.assembler.getNumOwnedNodes()
-        vpn = self.assembler.getVarsPerNode()
         F_array = F_array.reshape(nnodes, vpn)
 
-        # Loop through every node and if it's owned by this processor, add the load
-        for i, nodeID in enumerate(localNodeIDs):
-            # The node was found on this proc
-            if nodeID >= 0:
-                # Add contribution to global force array
-                F_array[nodeID, :] += F[i]
-                nodeFound[i] = 1
+        # Add the load of every node owned by this processor to the global
+        # force array, np.add.at accumulates repeated node IDs
+        ownedNodes = nodeFound.nonzero()[0]
+        np.add.at(F_array, localNodeIDs[ownedNodes], F[ownedNodes])
 
         # Reduce the node flag and make sure that every node was found on exactly 1 proc
         nodeFound = self.comm.allreduce(nodeFound, op=MPI.SUM)
@@ -554,7 +552,7 @@ class TACSProblem(BaseUI):
                     )
                 )
             rhsArray = Frhs.getArray()
-            rhsArray[:] = rhsArray[:] + Fapplied[:]
+            np.add(rhsArray, Fapplied, out=rhsArray)
 
     def _addTractionToComponents(self, auxElems, compIDs, tractions, faceIndex=0):
         """
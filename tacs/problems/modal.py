@@ -277,7 +277,7 @@ class ModalProblem(TACSProblem):
         if evalFuncs is None:
             evalFuncs = self.functionList
         else:
-            userFuncs = sorted(list(evalFuncs))
+            userFuncs = sorted(evalFuncs)
             evalFuncs = {}
             for func in userFuncs:
                 if func in self.functionList:
@@ -328,7 +328,7 @@ class ModalProblem(TACSProblem):
         if evalFuncs is None:
             evalFuncs = self.functionList
         else:
-            userFuncs = sorted(list(evalFuncs))
+            userFuncs = sorted(evalFuncs)
             evalFuncs = {}
             for func in userFuncs:
                 if func in self.functionList:
@@ -14,7 +14,7 @@ other pieces of information.
 import copy
 import os
 import time
-from collections import OrderedDict
+from functools import wraps
 
 import numpy as np
 
@@ -23,6 +23,30 @@ import tacs.elements
 from .base import TACSProblem
 
 
+def _noTimer():
+    return 0.0
+
+
+# Define decorator function for methods that make several assembler calls
+def hold_assembler_vars(method):
+    @wraps(method)
+    def wrapped_method(self, *args, **kwargs):
+        # Already inside a held call, nothing more to do
+        if self._assemblerVarsCurrent:
+            return method(self, *args, **kwargs)
+        # Update the assembler once and skip the repeated updates made by
+        # the helper methods. The assembler may be shared with other
+        # problems, so the flag is always reset on the way out.
+        self._updateAssemblerVars()
+        self._assemblerVarsCurrent = True
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._assemblerVarsCurrent = False
+
+    return wrapped_method
+
+
 class StaticProblem(TACSProblem):
     # Default options for class
     defaultOptions = {
@@ -143,9 +167,26 @@ class StaticProblem(TACSProblem):
         # Set linear solver to None, until we set it up later
         self.KSM = None
 
+        # Flag for whether the assembler already holds this problem's
+        # variables, only set for the duration of a hold_assembler_vars call
+        self._assemblerVarsCurrent = False
+
+        # Output dictionary keys for each function, set in addFunction
+        self._funcKey = {}
+        # Index of each function in the adjoint/sens vector lists
+        self._funcIdx = {}
+        # Sorted function names and matching handles, set in addFunction
+        self._sortedFuncNames = []
+        self._sortedFuncHandles = []
+        # Function handles for each evalFuncs sequence seen, reset in addFunction
+        self._funcHandleCache = {}
+
         # Default setup for common problem class objects, sets up comm and options
         TACSProblem.__init__(self, assembler, comm, options, outputViewer, meshLoader)
 
+        # Read the options used in the solve/eval methods once up front
+        self._cacheOptions()
+
         # Create problem-specific variables
         self._createVariables()
 
@@ -155,20 +196,31 @@ class StaticProblem(TACSProblem):
         # Generic residual vector
         self.res = self.assembler.createVec()
         self.rhs = self.assembler.createVec()
-
-        # Dictionaries to hold adjoint/sens vectors for each evalFunc
-        self.adjointList = OrderedDict()
-        self.dIduList = OrderedDict()
-        self.dvSensList = OrderedDict()
-        self.xptSensList = OrderedDict()
+        self._rhs_array = self.rhs.getArray()
+
+        # Lists to hold adjoint/sens vectors for each evalFunc,
+        # indexed through self._funcIdx
+        self._adjoints = []
+        self._dIdus = []
+        self._dvSens = []
+        self._xptSens = []
+        for _ in range(len(self._funcIdx)):
+            self._addSensVecs()
         # Temporary vector for adjoint solve
         self.phi = self.assembler.createVec()
         self.adjRHS = self.assembler.createVec()
-
-        # Load vector
+        # Pools of BVecs reused for lists of user-supplied numpy arrays
+        self._sensVecPool = {
+            "state": (self.assembler.createVec, []),
+            "design": (self.assembler.createDesignVec, []),
+            "node": (self.assembler.createNodeVec, []),
+        }
+
+        # Load vector, its array is accessed through the F_array property
         self.F = self.assembler.createVec()
-        self.F_array = self.F.getArray()
-        # State variable vector
+        self._F_array = self.F.getArray()
+        # State variable vector. u_array is a view of the BVec's own storage,
+        # which is only replaced when the variables are recreated here
         self.u = self.assembler.createVec()
         self.u_array = self.u.getArray()
         # Auxiliary element object for applying tractions/pressure
@@ -203,8 +255,8 @@ class StaticProblem(TACSProblem):
 
         # Computes stiffness matrix w/o art. terms
         # Set artificial stiffness factors in rbe class to zero
-        tacs.elements.RBE2.setScalingParameters(opt("RBEStiffnessScaleFactor"), 0.0)
-        tacs.elements.RBE3.setScalingParameters(opt("RBEStiffnessScaleFactor"), 0.0)
+        tacs.elements.RBE2.setScalingParameters(self._opt_RBEStiffnessScaleFactor, 0.0)
+        tacs.elements.RBE3.setScalingParameters(self._opt_RBEStiffnessScaleFactor, 0.0)
         self.assembler.assembleJacobian(
             self.alpha,
             self.beta,
@@ -217,10 +269,10 @@ class StaticProblem(TACSProblem):
         # Now isolate art. terms
         # Recompute stiffness with artificial terms included
         tacs.elements.RBE2.setScalingParameters(
-            opt("RBEStiffnessScaleFactor"), opt("RBEArtificialStiffness")
+            self._opt_RBEStiffnessScaleFactor, opt("RBEArtificialStiffness")
         )
         tacs.elements.RBE3.setScalingParameters(
-            opt("RBEStiffnessScaleFactor"), opt("RBEArtificialStiffness")
+            self._opt_RBEStiffnessScaleFactor, opt("RBEArtificialStiffness")
         )
         self.assembler.assembleJacobian(
             self.alpha, self.beta, self.gamma, None, self.rbeArtificialStiffness
@@ -256,9 +308,7 @@ class StaticProblem(TACSProblem):
                 "Unknown KSMSolver option. Valid options are " "'GMRES' or 'GCROT'"
             )
 
-        self.KSM.setTolerances(
-            self.getOption("L2ConvergenceRel"), self.getOption("L2Convergence")
-        )
+        self.KSM.setTolerances(self._opt_L2ConvergenceRel, self._opt_L2Convergence)
 
         if opt("useMonitor"):
             self.KSM.setMonitor(
@@ -267,7 +317,7 @@ class StaticProblem(TACSProblem):
                 freq=opt("monitorFrequency"),
             )
 
-        # Linear solver factor flag
+        # Linear solver factor flag, set whenever the stiffness matrix changes
         self._factorOnNext = True
 
     def setOption(self, name, value):
@@ -285,12 +335,14 @@ class StaticProblem(TACSProblem):
         # Default setOption for common problem class objects
         TACSProblem.setOption(self, name, value)
 
+        # Refresh the cached option values
+        self._cacheOptions()
+
         if self.KSM is not None:
             # Update tolerances
             if "l2convergence" in name.lower():
                 self.KSM.setTolerances(
-                    self.getOption("L2ConvergenceRel"),
-                    self.getOption("L2Convergence"),
+                    self._opt_L2ConvergenceRel, self._opt_L2Convergence
                 )
             # No need to reset solver for output options
             elif name.lower() in [
@@ -304,6 +356,39 @@ class StaticProblem(TACSProblem):
             else:
                 self._createVariables()
 
+    def _cacheOptions(self):
+        """
+        Store the option values read by the solve/eval methods as attributes,
+        so we don't have to go through getOption on every call.
+        """
+        opt = self.getOption
+        self._opt_L2Convergence = opt("L2Convergence")
+        self._opt_L2ConvergenceRel = opt("L2ConvergenceRel")
+        self._opt_RBEStiffnessScaleFactor = opt("RBEStiffnessScaleFactor")
+        self._opt_printTiming = opt("printTiming")
+        # Only read the clock when the timing is going to be printed
+        self._timer = time.perf_counter if self._opt_printTiming else _noTimer
+        self._opt_writeSolution = opt("writeSolution")
+        self._opt_numberSolutions = opt("numberSolutions")
+        self._opt_outputDir = opt("outputDir")
+        # Default output file path (without numbering) for writeSolution
+        self._outputBase = os.path.join(self._opt_outputDir, self.name)
+
+    @property
+    def F_array(self):
+        """Local values of the fixed load vector
+
+        This is a view of the storage of ``self.F``, so writing to it
+        changes the applied loads. Fetch it again after changing any solver
+        option, since that recreates the problem vectors.
+
+        Returns
+        -------
+        numpy.ndarray
+            The local entries of the fixed load vector
+        """
+        return self.F.getArray()
+
     @property
     def loadScale(self):
         """This is a scaling factor applied to all forcing terms
@@ -372,13 +457,45 @@ class StaticProblem(TACSProblem):
         """
         success = TACSProblem.addFunction(self, funcName, funcHandle, compIDs, **kwargs)
         if success:
-            # Create additional tacs BVecs to hold adjoint and sens info
-            self.adjointList[funcName] = self.assembler.createVec()
-            self.dIduList[funcName] = self.assembler.createVec()
-            self.dvSensList[funcName] = self.assembler.createDesignVec()
-            self.xptSensList[funcName] = self.assembler.createNodeVec()
+            # Create additional tacs BVecs to hold adjoint and sens info,
+            # unless this function name already has them
+            if funcName not in self._funcIdx:
+                self._funcIdx[funcName] = len(self._adjoints)
+                self._addSensVecs()
+            # Key used for this function in the output dictionaries
+            self._funcKey[funcName] = self.name + "_" + funcName
+            # Cached handle lists may be missing or have replaced this function
+            self._funcHandleCache = {}
+            # Default evaluation order used when evalFuncs isn't given
+            self._sortedFuncNames = sorted(self.functionList)
+            self._sortedFuncHandles = [
+                self.functionList[f] for f in self._sortedFuncNames
+            ]
         return success
 
+    def _getFuncHandles(self, evalFuncs):
+        """
+        Get the list of TACS function handles for the names in evalFuncs,
+        skipping any functions that haven't been added
+        """
+        key = tuple(evalFuncs)
+        funcHandles = self._funcHandleCache.get(key)
+        if funcHandles is None:
+            funcHandles = [
+                self.functionList[f] for f in evalFuncs if f in self.functionList
+            ]
+            self._funcHandleCache[key] = funcHandles
+        return funcHandles
+
+    def _addSensVecs(self):
+        """
+        Append a new set of adjoint/sens BVecs for one function
+        """
+        self._adjoints.append(self.assembler.createVec())
+        self._dIdus.append(self.assembler.createVec())
+        self._dvSens.append(self.assembler.createDesignVec())
+        self._xptSens.append(self.assembler.createNodeVec())
+
     def setDesignVars(self, x):
         """
         Update the design variables used by tacs.
@@ -683,6 +800,9 @@ class StaticProblem(TACSProblem):
         Make sure that the assembler is using
         the input variables associated with this problem
         """
+        # Skip if the assembler was already updated by the current call
+        if self._assemblerVarsCurrent:
+            return
 
         self.assembler.setDesignVars(self.x)
         self.assembler.setNodes(self.Xpts)
@@ -693,12 +813,8 @@ class StaticProblem(TACSProblem):
         self.assembler.zeroDotVariables()
         self.assembler.zeroDDotVariables()
         # Set artificial stiffness factors in rbe class to zero
-        tacs.elements.RBE2.setScalingParameters(
-            self.getOption("RBEStiffnessScaleFactor"), 0.0
-        )
-        tacs.elements.RBE3.setScalingParameters(
-            self.getOption("RBEStiffnessScaleFactor"), 0.0
-        )
+        tacs.elements.RBE2.setScalingParameters(self._opt_RBEStiffnessScaleFactor, 0.0)
+        tacs.elements.RBE3.setScalingParameters(self._opt_RBEStiffnessScaleFactor, 0.0)
 
     def _initializeSolve(self):
         """
@@ -724,11 +840,18 @@ class StaticProblem(TACSProblem):
             self.K.axpy(-1.0, self.rbeArtificialStiffness)
             self._factorOnNext = False
 
+    @hold_assembler_vars
     def solve(self, Fext=None):
         """
         Solution of the static problem for current load set. The
         forces must already be set.
 
+        The stiffness matrix is only reassembled and refactored when the
+        design variables, nodes, or load scale have changed since the last
+        factorization. Changing only the loads (or ``Fext``) between calls
+        reuses the existing factorization, so when sweeping through several
+        load cases avoid modifying the design variables between solves.
+
         Parameters
         ----------
         Optional Arguments:
@@ -738,11 +861,11 @@ class StaticProblem(TACSProblem):
             to applied to RHS of the static problem.
 
         """
-        startTime = time.time()
+        startTime = self._timer()
 
         self.callCounter += 1
 
-        setupProblemTime = time.time()
+        setupProblemTime = self._timer()
 
         # Set problem vars to assembler
         self._updateAssemblerVars()
@@ -750,7 +873,7 @@ class StaticProblem(TACSProblem):
         # Check if we need to initialize
         self._initializeSolve()
 
-        initSolveTime = time.time()
+        initSolveTime = self._timer()
 
         # Get current residual
         self.getResidual(self.res, Fext=Fext)
@@ -760,12 +883,12 @@ class StaticProblem(TACSProblem):
         self.rhs.axpy(-1.0, self.res)
 
         # Set initnorm as the norm of rhs
-        self.initNorm = np.real(self.rhs.norm())
+        self.initNorm = self.rhs.norm().real
 
         # Starting Norm for this computation
-        self.startNorm = np.real(self.res.norm())
+        self.startNorm = self.res.norm().real
 
-        initNormTime = time.time()
+        initNormTime = self._timer()
 
         # Solve Linear System for the update
         success = self.KSM.solve(self.res, self.update)
@@ -777,26 +900,24 @@ class StaticProblem(TACSProblem):
                 "Check that the model is properly restrained."
             )
 
-        self.update.scale(-1.0)
-
-        solveTime = time.time()
+        solveTime = self._timer()
 
-        # Update State Variables
+        # Update State Variables, the update is the negative of the solution
         self.assembler.getVariables(self.u)
-        self.u.axpy(1.0, self.update)
+        self.u.axpy(-1.0, self.update)
         self.assembler.setVariables(self.u)
 
-        stateUpdateTime = time.time()
+        stateUpdateTime = self._timer()
 
         # Get updated residual
         self.getResidual(self.res, Fext)
-        self.finalNorm = np.real(self.res.norm())
+        self.finalNorm = self.res.norm().real
 
-        finalNormTime = time.time()
+        finalNormTime = self._timer()
 
         # If timing was was requested print it, if the solution is nonlinear
         # print this information automatically if prinititerations was requested.
-        if self.getOption("printTiming"):
+        if self._opt_printTiming:
             self._pp("+--------------------------------------------------+")
             self._pp("|")
             self._pp("| TACS Solve Times:")
@@ -861,43 +982,45 @@ class StaticProblem(TACSProblem):
         >>> # Result will look like (if StaticProblem has name of 'c1'):
         >>> # {'cl_mass':12354.10}
         """
-        startTime = time.time()
+        startTime = self._timer()
 
         # Set problem vars to assembler
         self._updateAssemblerVars()
 
         if evalFuncs is None:
-            evalFuncs = sorted(list(self.functionList))
+            evalFuncs = self._sortedFuncNames
+            handles = self._sortedFuncHandles
         else:
-            evalFuncs = sorted(list(evalFuncs))
-
-        if not ignoreMissing:
-            for f in evalFuncs:
-                if f not in self.functionList:
-                    raise self._TACSError(
-                        f"Supplied function '{f}' has not been added "
-                        "using addFunction()."
-                    )
+            evalFuncs = sorted(evalFuncs)
+            get = self.functionList.get
+            handles = [get(f) for f in evalFuncs]
+
+            if not ignoreMissing:
+                for f, handle in zip(evalFuncs, handles):
+                    if handle is None:
+                        raise self._TACSError(
+                            f"Supplied function '{f}' has not been added "
+                            "using addFunction()."
+                        )
+            else:
+                # Skip over any functions that haven't been added
+                evalFuncs = [f for f, h in zip(evalFuncs, handles) if h is not None]
+                handles = [h for h in handles if h is not None]
 
-        setupProblemTime = time.time()
+        setupProblemTime = self._timer()
 
         # Fast parallel function evaluation of structural funcs:
-        handles = [self.functionList[f] for f in evalFuncs if f in self.functionList]
         funcVals = self.assembler.evalFunctions(handles)
 
-        functionEvalTime = time.time()
+        functionEvalTime = self._timer()
 
         # Assign function values to appropriate dictionary
-        i = 0
-        for f in evalFuncs:
-            if f in self.functionList:
-                key = self.name + "_%s" % f
-                funcs[key] = funcVals[i]
-                i += 1
+        for f, funcVal in zip(evalFuncs, funcVals):
+            funcs[self._funcKey[f]] = funcVal
 
-        dictAssignTime = time.time()
+        dictAssignTime = self._timer()
 
-        if self.getOption("printTiming"):
+        if self._opt_printTiming:
             self._pp("+--------------------------------------------------+")
             self._pp("|")
             self._pp("| TACS Function Times:")
@@ -924,6 +1047,7 @@ class StaticProblem(TACSProblem):
             )
             self._pp("+--------------------------------------------------+")
 
+    @hold_assembler_vars
     def evalFunctionsSens(self, funcsSens, evalFuncs=None):
         """
         This is the main routine for returning useful (sensitivity)
@@ -948,15 +1072,15 @@ class StaticProblem(TACSProblem):
         >>> # {'c1_mass':{'struct':[1.234, ..., 7.89], 'Xpts':[3.14, ..., 1.59]}}
         """
 
-        startTime = time.time()
+        startTime = self._timer()
 
         # Set problem vars to assembler
         self._updateAssemblerVars()
 
         if evalFuncs is None:
-            evalFuncs = sorted(list(self.functionList))
+            evalFuncs = self._sortedFuncNames
         else:
-            evalFuncs = sorted(list(evalFuncs))
+            evalFuncs = sorted(evalFuncs)
         # Check that the functions are all ok.
         # and prepare tacs vecs for adjoint procedure
         dvSenses = []
@@ -971,56 +1095,64 @@ class StaticProblem(TACSProblem):
             else:
                 # Populate the lists with the tacs bvecs
                 # we'll need for each adjoint/sens calculation
-                dvSens = self.dvSensList[f]
+                i = self._funcIdx[f]
+
+                dvSens = self._dvSens[i]
                 dvSens.zeroEntries()
                 dvSenses.append(dvSens)
 
-                xptSens = self.xptSensList[f]
+                xptSens = self._xptSens[i]
                 xptSens.zeroEntries()
                 xptSenses.append(xptSens)
 
-                dIdu = self.dIduList[f]
+                dIdu = self._dIdus[i]
                 dIdu.zeroEntries()
                 dIdus.append(dIdu)
 
-                adjoint = self.adjointList[f]
+                adjoint = self._adjoints[i]
                 adjoint.zeroEntries()
                 adjoints.append(adjoint)
 
-        setupProblemTime = time.time()
-
-        adjointStartTime = {}
-        adjointEndTime = {}
+        setupProblemTime = self._timer()
 
         # Next we will solve all the adjoints
         # Set adjoint rhs
         self.addSVSens(evalFuncs, dIdus)
-        adjointRHSTime = time.time()
-        for i, f in enumerate(evalFuncs):
-            adjointStartTime[f] = time.time()
-            self.solveAdjoint(dIdus[i], adjoints[i])
-            adjointEndTime[f] = time.time()
+        adjointRHSTime = self._timer()
+        # All adjoints share the same factored stiffness matrix
+        self.solveAdjointBatched(dIdus, adjoints)
 
-        adjointFinishedTime = time.time()
+        adjointFinishedTime = self._timer()
         # Evaluate all the adoint res prooduct at the same time for
         # efficiency:
+        # The adjoints belong to this problem, so their BC terms can be
+        # zeroed out in place once for both products
+        for adjoint in adjoints:
+            self.assembler.applyBCs(adjoint)
         self.addDVSens(evalFuncs, dvSenses)
-        self.addAdjointResProducts(adjoints, dvSenses)
+        self._addAdjointResProducts(adjoints, dvSenses, -1.0)
         self.addXptSens(evalFuncs, xptSenses)
-        self.addAdjointResXptSensProducts(adjoints, xptSenses)
+        self._addAdjointResXptSensProducts(adjoints, xptSenses, -1.0)
+
+        # Copy the sensitivities for all functions into one block per
+        # variable type, each function gets a row of the block
+        nFuncs = len(evalFuncs)
+        dvSensArray = np.empty((nFuncs, self.x.getArray().size), dtype=self.dtype)
+        xptSensArray = np.empty((nFuncs, self.Xpts.getArray().size), dtype=self.dtype)
 
         # Recast sensititivities into dict for user
         for i, f in enumerate(evalFuncs):
-            key = self.name + "_%s" % f
+            np.copyto(dvSensArray[i], dvSenses[i].getArray())
+            np.copyto(xptSensArray[i], xptSenses[i].getArray())
             # Return sensitivities as array in sens dict
-            funcsSens[key] = {
-                self.varName: dvSenses[i].getArray().copy(),
-                self.coordName: xptSenses[i].getArray().copy(),
+            funcsSens[self._funcKey[f]] = {
+                self.varName: dvSensArray[i],
+                self.coordName: xptSensArray[i],
             }
 
-        totalSensitivityTime = time.time()
+        totalSensitivityTime = self._timer()
 
-        if self.getOption("printTiming"):
+        if self._opt_printTiming:
             self._pp("+--------------------------------------------------+")
             self._pp("|")
             self._pp("| TACS Adjoint Times:")
@@ -1033,14 +1165,10 @@ class StaticProblem(TACSProblem):
                 "| %-30s: %10.3f sec"
                 % ("TACS Adjoint RHS Time", adjointRHSTime - setupProblemTime)
             )
-            for f in evalFuncs:
-                print(
-                    "| %-30s: %10.3f sec"
-                    % (
-                        "TACS Adjoint Solve Time - %s" % (f),
-                        adjointEndTime[f] - adjointStartTime[f],
-                    )
-                )
+            print(
+                "| %-30s: %10.3f sec"
+                % ("TACS Adjoint Solve Time", adjointFinishedTime - adjointRHSTime)
+            )
             print(
                 "| %-30s: %10.3f sec"
                 % (
@@ -1074,27 +1202,17 @@ class StaticProblem(TACSProblem):
         self._updateAssemblerVars()
 
         # Get list of TACS function handles from evalFuncs
-        funcHandles = [
-            self.functionList[f] for f in evalFuncs if f in self.functionList
-        ]
-
-        # Create a tacs BVec copy for the operation if the output is a numpy array
-        if isinstance(svSensList[0], np.ndarray):
-            svSensBVecList = [
-                self._arrayToVec(svSensArray) for svSensArray in svSensList
-            ]
-        # Otherwise the input is already a BVec and we can do the operation in place
-        else:
-            svSensBVecList = svSensList
+        funcHandles = self._getFuncHandles(evalFuncs)
+
+        svSensBVecList, isArray = self._toVecs(svSensList, "state")
 
         self.assembler.addSVSens(
             funcHandles, svSensBVecList, self.alpha, self.beta, self.gamma
         )
 
         # Update from the BVec values, if the input was a numpy array
-        if isinstance(svSensList[0], np.ndarray):
-            for svSensArray, svSensBVec in zip(svSensList, svSensBVecList):
-                svSensArray[:] = svSensBVec.getArray()
+        if isArray:
+            self._copyToArrays(svSensList, svSensBVecList)
 
     def addDVSens(self, evalFuncs, dvSensList, scale=1.0):
         """
@@ -1115,31 +1233,13 @@ class StaticProblem(TACSProblem):
         self._updateAssemblerVars()
 
         # Get list of TACS function handles from evalFuncs
-        funcHandles = [
-            self.functionList[f] for f in evalFuncs if f in self.functionList
-        ]
-
-        # Create a tacs BVec copy for the operation if the output is a numpy array
-        if isinstance(dvSensList[0], np.ndarray):
-            dvSensBVecList = [
-                self._arrayToDesignVec(dvSensArray) for dvSensArray in dvSensList
-            ]
-        # Otherwise the input is already a BVec and we can do the operation in place
-        else:
-            dvSensBVecList = dvSensList
+        funcHandles = self._getFuncHandles(evalFuncs)
 
-        self.assembler.addDVSens(funcHandles, dvSensBVecList, scale)
+        dvSensBVecList, isArray = self._toVecs(dvSensList, "design")
 
-        # Finalize sensitivity arrays across all procs
-        for dvSensBVec in dvSensBVecList:
-            dvSensBVec.beginSetValues()
-            dvSensBVec.endSetValues()
+        self.assembler.addDVSens(funcHandles, dvSensBVecList, scale)
 
-        # Update the BVec values, if the input was a numpy array
-        if isinstance(dvSensList[0], np.ndarray):
-            for dvSensArray, dvSensBVec in zip(dvSensList, dvSensBVecList):
-                # Copy values to numpy array
-                dvSensArray[:] = dvSensBVec.getArray()
+        self._finalizeSensVecs(dvSensBVecList, dvSensList, isArray)
 
     def addAdjointResProducts(self, adjointlist, dvSensList, scale=-1.0):
         """
@@ -1159,40 +1259,20 @@ class StaticProblem(TACSProblem):
         # Set problem vars to assembler
         self._updateAssemblerVars()
 
-        # Create a tacs BVec copy for the operation if the output is a numpy array
-        if isinstance(adjointlist[0], np.ndarray):
-            adjointBVeclist = [
-                self._arrayToVec(adjointArray) for adjointArray in adjointlist
-            ]
-        # Otherwise the input is already a BVec and we can do the operation in place
-        else:
-            adjointBVeclist = adjointlist
-
-        # Make sure BC terms are zeroed out in adjoint
-        for adjoint in adjointBVeclist:
-            self.assembler.applyBCs(adjoint)
+        adjointBVeclist = self._adjointVecs(adjointlist)
+        self._addAdjointResProducts(adjointBVeclist, dvSensList, scale)
 
-        # Create a tacs BVec copy for the operation if the output is a numpy array
-        if isinstance(dvSensList[0], np.ndarray):
-            dvSensBVecList = [
-                self._arrayToDesignVec(dvSensArray) for dvSensArray in dvSensList
-            ]
-        # Otherwise the input is already a BVec and we can do the operation in place
-        else:
-            dvSensBVecList = dvSensList
+    def _addAdjointResProducts(self, adjointBVeclist, dvSensList, scale):
+        """
+        Add the adjoint product contribution to the design variable
+        sensitivity arrays, for adjoint BVecs that already have their
+        BC terms zeroed out
+        """
+        dvSensBVecList, isArray = self._toVecs(dvSensList, "design")
 
         self.assembler.addAdjointResProducts(adjointBVeclist, dvSensBVecList, scale)
 
-        # Finalize sensitivity arrays across all procs
-        for dvSensBVec in dvSensBVecList:
-            dvSensBVec.beginSetValues()
-            dvSensBVec.endSetValues()
-
-        # Update the BVec values, if the input was a numpy array
-        if isinstance(dvSensList[0], np.ndarray):
-            for dvSensArray, dvSensBVec in zip(dvSensList, dvSensBVecList):
-                # Copy values to numpy array
-                dvSensArray[:] = dvSensBVec.getArray()
+        self._finalizeSensVecs(dvSensBVecList, dvSensList, isArray)
 
     def addXptSens(self, evalFuncs, xptSensList, scale=1.0):
         """
@@ -1213,31 +1293,13 @@ class StaticProblem(TACSProblem):
         self._updateAssemblerVars()
 
         # Get list of TACS function handles from evalFuncs
-        funcHandles = [
-            self.functionList[f] for f in evalFuncs if f in self.functionList
-        ]
-
-        # Create a tacs BVec copy for the operation if the output is a numpy array
-        if isinstance(xptSensList[0], np.ndarray):
-            xptSensBVecList = [
-                self._arrayToNodeVec(xptSensArray) for xptSensArray in xptSensList
-            ]
-        # Otherwise the input is already a BVec and we can do the operation in place
-        else:
-            xptSensBVecList = xptSensList
+        funcHandles = self._getFuncHandles(evalFuncs)
+
+        xptSensBVecList, isArray = self._toVecs(xptSensList, "node")
 
         self.assembler.addXptSens(funcHandles, xptSensBVecList, scale)
 
-        # Finalize sensitivity arrays across all procs
-        for xptSensBVec in xptSensBVecList:
-            xptSensBVec.beginSetValues()
-            xptSensBVec.endSetValues()
-
-        # Update from the BVec values, if the input was a numpy array
-        if isinstance(xptSensList[0], np.ndarray):
-            for xptSensArray, xptSensBVec in zip(xptSensList, xptSensBVecList):
-                # Copy values to numpy array
-                xptSensArray[:] = xptSensBVec.getArray()
+        self._finalizeSensVecs(xptSensBVecList, xptSensList, isArray)
 
     def addAdjointResXptSensProducts(self, adjointlist, xptSensList, scale=-1.0):
         """
@@ -1257,41 +1319,110 @@ class StaticProblem(TACSProblem):
         # Set problem vars to assembler
         self._updateAssemblerVars()
 
-        # Create a tacs BVec copy for the operation if the output is a numpy array
-        if isinstance(adjointlist[0], np.ndarray):
-            adjointBVeclist = [
-                self._arrayToVec(adjointArray) for adjointArray in adjointlist
-            ]
+        adjointBVeclist = self._adjointVecs(adjointlist)
+        self._addAdjointResXptSensProducts(adjointBVeclist, xptSensList, scale)
+
+    def _addAdjointResXptSensProducts(self, adjointBVeclist, xptSensList, scale):
+        """
+        Add the adjoint product contribution to the nodal coordinates
+        sensitivity arrays, for adjoint BVecs that already have their
+        BC terms zeroed out
+        """
+        xptSensBVecList, isArray = self._toVecs(xptSensList, "node")
+
+        self.assembler.addAdjointResXptSensProducts(
+            adjointBVeclist, xptSensBVecList, scale
+        )
+
+        self._finalizeSensVecs(xptSensBVecList, xptSensList, isArray)
+
+    def _toVecs(self, vecList, kind):
+        """
+        Get a list of tacs BVecs to operate on for the user-supplied vectors.
+
+        Parameters
+        ----------
+        vecList : list[BVec] or list[numpy.ndarray]
+            User-supplied vectors
+
+        kind : str
+            Type of vector, either "state", "design" or "node"
+
+        Returns
+        -------
+        bvecList : list[BVec]
+            The tacs BVecs, reused copies if the input was numpy arrays
+
+        isArray : bool
+            True if the input was numpy arrays
+        """
+        # Copy into reusable tacs BVecs for the operation if the input is a numpy array
+        if isinstance(vecList[0], np.ndarray):
+            bvecList = self._pooledVecs(kind, len(vecList))
+            for bvec, array in zip(bvecList, vecList):
+                np.copyto(bvec.getArray(), array)
+            return bvecList, True
         # Otherwise the input is already a BVec and we can do the operation in place
+        return vecList, False
+
+    def _pooledVecs(self, kind, n):
+        """
+        Get n reusable tacs BVecs of the given kind ("state", "design" or "node").
+        """
+        createVec, pool = self._sensVecPool[kind]
+        # Only allocate new BVecs when more are needed than ever before
+        while len(pool) < n:
+            pool.append(createVec())
+        bvecList = pool[:n]
+        # Clear the values left by the previous use, including the ghost and
+        # dependent node entries, which TACS would otherwise add into the
+        # owned entries of sensitivity vectors
+        for bvec in bvecList:
+            bvec.zeroEntries()
+        return bvecList
+
+    def _adjointVecs(self, adjointlist):
+        """
+        Get copies of a list of adjoint vectors with the BC terms zeroed out.
+        The user-supplied adjoint vectors are left unchanged.
+        """
+        if isinstance(adjointlist[0], np.ndarray):
+            adjointBVeclist, _ = self._toVecs(adjointlist, "state")
         else:
-            adjointBVeclist = adjointlist
+            adjointBVeclist = self._pooledVecs("state", len(adjointlist))
+            for bvec, adjoint in zip(adjointBVeclist, adjointlist):
+                bvec.copyValues(adjoint)
 
         # Make sure BC terms are zeroed out in adjoint
+        applyBCs = self.assembler.applyBCs
         for adjoint in adjointBVeclist:
-            self.assembler.applyBCs(adjoint)
+            applyBCs(adjoint)
 
-        # Create a tacs BVec copy for the operation if the output is a numpy array
-        if isinstance(xptSensList[0], np.ndarray):
-            xptSensBVecList = [
-                self._arrayToNodeVec(xptSensArray) for xptSensArray in xptSensList
-            ]
-        # Otherwise the input is already a BVec and we can do the operation in place
-        else:
-            xptSensBVecList = xptSensList
+        return adjointBVeclist
 
-        self.assembler.addAdjointResXptSensProducts(
-            adjointBVeclist, xptSensBVecList, scale
-        )
+    def _finalizeSensVecs(self, bvecList, vecList, isArray):
+        """
+        Finalize sensitivity BVecs across all procs and, if the
+        user-supplied vectors were numpy arrays, copy the values back.
+        """
+        # Finalize sensitivity arrays across all procs, start all of the
+        # exchanges before waiting on any so they can progress together
+        for bvec in bvecList:
+            bvec.beginSetValues()
+        for bvec in bvecList:
+            bvec.endSetValues()
 
-        # Finalize sensitivity arrays across all procs
-        for xptSensBVec in xptSensBVecList:
-            xptSensBVec.beginSetValues()
-            xptSensBVec.endSetValues()
+        # Update the user arrays from the BVec values
+        if isArray:
+            self._copyToArrays(vecList, bvecList)
 
-        if isinstance(xptSensList[0], np.ndarray):
-            for xptSensArray, xptSensBVec in zip(xptSensList, xptSensBVecList):
-                # Copy values to numpy array
-                xptSensArray[:] = xptSensBVec.getArray()
+    def _copyToArrays(self, arrayList, bvecList):
+        """
+        Copy the values of tacs BVecs back into the user-supplied numpy arrays.
+        """
+        # The arrays may be real even when TACS is complex
+        for array, bvec in zip(arrayList, bvecList):
+            np.copyto(array, bvec.getArray(), casting="unsafe")
 
     def getResidual(self, res, Fext=None):
         """
@@ -1319,15 +1450,17 @@ class StaticProblem(TACSProblem):
             res = self.res
 
         # Sum the forces from the loads not handled by TACS
-        self.rhs.copyValues(self.F)  # Fixed loads
-
-        # Add external loads, if specified
-        if Fext is not None:
+        if isinstance(Fext, np.ndarray):
+            rhsArray = self._rhs_array
+            if Fext.dtype != rhsArray.dtype:
+                Fext = Fext.astype(rhsArray.dtype, copy=False)
+            # Write the sum straight into rhs, no separate copy of F
+            np.add(self._F_array, Fext, out=rhsArray)
+        else:
+            self.rhs.copyValues(self.F)  # Fixed loads
+            # Add external loads, if specified
             if isinstance(Fext, tacs.TACS.Vec):
                 self.rhs.axpy(1.0, Fext)
-            elif isinstance(Fext, np.ndarray):
-                rhsArray = self.rhs.getArray()
-                rhsArray[:] = rhsArray[:] + Fext[:]
 
         # Zero out forces on DOF that are subject to BCs
         self.assembler.applyBCs(self.rhs)
@@ -1336,9 +1469,10 @@ class StaticProblem(TACSProblem):
         self.assembler.assembleRes(res, self._loadScale)
         res.axpy(-self._loadScale, self.rhs)
 
-        # If requested, copy the residual to the output array
+        # If requested, copy the residual to the output array,
+        # which may be real even when TACS is complex
         if resArray is not None:
-            resArray[:] = res.getArray()
+            np.copyto(resArray, res.getArray(), casting="unsafe")
 
     def getJacobian(self):
         """Get the problem's Jacobian in sciPy sparse matrix format
@@ -1375,7 +1509,7 @@ class StaticProblem(TACSProblem):
         if isinstance(phi, tacs.TACS.Vec):
             self.phi.copyValues(phi)
         elif isinstance(phi, np.ndarray):
-            self.phi.getArray()[:] = phi
+            np.copyto(self.phi.getArray(), phi)
 
         # Tacs doesn't actually transpose the matrix here so keep track of
         # RHS entries that TACS zeros out for BCs.
@@ -1395,7 +1529,11 @@ class StaticProblem(TACSProblem):
         if isinstance(prod, tacs.TACS.Vec):
             prod.axpy(scale, self.res)
         else:
-            prod[:] = prod + scale * self.res.getArray()
+            # Scale the product in place and add it to the user array
+            # without creating any temporary arrays. The array may be
+            # real even when TACS is complex.
+            self.res.scale(scale)
+            np.add(prod, self.res.getArray(), out=prod, casting="unsafe")
 
     def zeroVariables(self):
         """
@@ -1431,16 +1569,50 @@ class StaticProblem(TACSProblem):
         # Check if we need to initialize
         self._initializeSolve()
 
-        # Create a copy of the adjoint/rhs guess
-        if isinstance(phi, tacs.TACS.Vec):
-            self.phi.copyValues(phi)
-        elif isinstance(phi, np.ndarray):
-            self.phi.getArray()[:] = phi
+        self._solveAdjoint(rhs, phi)
+
+    def solveAdjointBatched(self, rhsList, phiList):
+        """
+        Solve the structural adjoint for several right hand sides.
+        All of the solves share the same stiffness matrix and preconditioner,
+        so the assembler variables are only updated and the matrix only
+        factored (if required) once for the whole batch.
 
+        Parameters
+        ----------
+        rhsList : list[TACS BVec] or list[numpy array]
+            right hand side vectors for adjoint solves
+        phiList : list[TACS BVec] or list[numpy array]
+            BVecs or numpy arrays into which the adjoints are saved
+        """
+
+        # Set problem vars to assembler
+        self._updateAssemblerVars()
+
+        # Check if we need to initialize
+        self._initializeSolve()
+
+        for rhs, phi in zip(rhsList, phiList):
+            self._solveAdjoint(rhs, phi)
+
+    def _solveAdjoint(self, rhs, phi):
+        """
+        Solve the structural adjoint, assuming the assembler variables
+        are up-to-date and the preconditioner has been factored.
+
+        Parameters
+        ----------
+        rhs : TACS BVec or numpy array
+            right hand side vector for adjoint solve
+        phi : TACS BVec or numpy array
+            BVec or numpy array into which the adjoint is saved
+        """
+        # Create a copy of the rhs. The solve below starts from a zero guess,
+        # so there is no need to copy the incoming values of phi.
         if isinstance(rhs, tacs.TACS.Vec):
             self.adjRHS.copyValues(rhs)
         elif isinstance(rhs, np.ndarray):
-            self.adjRHS.getArray()[:] = rhs
+            np.copyto(self.adjRHS.getArray(), rhs)
 
         # Tacs doesn't actually transpose the matrix here so keep track of
         # RHS entries that TACS zeros out for BCs.
@@ -1455,13 +1627,14 @@ class StaticProblem(TACSProblem):
         # Add bc terms back in
         self.phi.axpy(1.0, bcTerms)
 
-        # Copy output values back to user vectors
+        # Copy output values back to user vectors, numpy arrays
+        # may be real even when TACS is complex
         if isinstance(phi, tacs.TACS.Vec):
             phi.copyValues(self.phi)
         elif isinstance(phi, np.ndarray):
-            phi[:] = self.phi.getArray()
+            np.copyto(phi, self.phi.getArray(), casting="unsafe")
 
-    def getVariables(self, states=None):
+    def getVariables(self, states=None, readonly=False):
         """
         Return the current state values for the
         problem
@@ -1471,6 +1644,11 @@ class StaticProblem(TACSProblem):
         states : TACS.Vec or numpy.ndarray
             Vector to place current state variables into (optional)
 
+        readonly : bool
+            Return a read-only view of the state vector instead of a copy.
+            The view is changed by any later solve or call to setVariables.
+            Defaults to False.
+
         Returns
         ----------
         states : numpy.ndarray
@@ -1480,7 +1658,13 @@ class StaticProblem(TACSProblem):
         if isinstance(states, tacs.TACS.Vec):
             states.copyValues(self.u)
         elif isinstance(states, np.ndarray):
-            states[:] = self.u_array[:]
+            # The array may be real even when TACS is complex
+            np.copyto(states, self.u_array, casting="unsafe")
+
+        if readonly:
+            u = self.u.getArray()
+            u.flags.writeable = False
+            return u
 
         return self.u_array.copy()
 
@@ -1497,7 +1681,7 @@ class StaticProblem(TACSProblem):
         if isinstance(states, tacs.TACS.Vec):
             self.u.copyValues(states)
         elif isinstance(states, np.ndarray):
-            self.u_array[:] = states[:]
+            np.copyto(self.u_array, states)
         # Apply boundary conditions
         self.assembler.applyBCs(self.u)
         # Set states to assembler
@@ -1523,28 +1707,32 @@ class StaticProblem(TACSProblem):
             Use the user supplied number to index solution. Again, only
             typically used from an external solver
         """
+        # Unless the writeSolution option is off write actual file:
+        if not self._opt_writeSolution:
+            return
+
         # Make sure assembler variables are up to date
         self._updateAssemblerVars()
 
-        # Check input
-        if outputDir is None:
-            outputDir = self.getOption("outputDir")
-
-        if baseName is None:
-            baseName = self.name
+        # Check input, the default path is only joined when the options change
+        if outputDir is None and baseName is None:
+            base = self._outputBase
+        else:
+            if outputDir is None:
+                outputDir = self._opt_outputDir
+            if baseName is None:
+                baseName = self.name
+            base = os.path.join(outputDir, baseName)
 
         # If we are numbering solution, it saving the sequence of
         # calls, add the call number
         if number is not None:
             # We need number based on the provided number:
-            baseName = baseName + "_%3.3d" % number
+            base = base + "_%3.3d" % number
         else:
             # if number is none, i.e. standalone, but we need to
             # number solutions, use internal counter
-            if self.getOption("numberSolutions"):
-                baseName = baseName + "_%3.3d" % self.callCounter
+            if self._opt_numberSolutions:
+                base = base + "_%3.3d" % self.callCounter
 
-        # Unless the writeSolution option is off write actual file:
-        if self.getOption("writeSolution"):
-            base = os.path.join(outputDir, baseName) + ".f5"
-            self.outputViewer.writeToFile(base)
+        self.outputViewer.writeToFile(base + ".f5")
@@ -1083,9 +1083,9 @@ class TransientProblem(TACSProblem):
         self._updateAssemblerVars()
 
         if evalFuncs is None:
-            evalFuncs = sorted(list(self.functionList))
+            evalFuncs = sorted(self.functionList)
         else:
-            evalFuncs = sorted(list(evalFuncs))
+            evalFuncs = sorted(evalFuncs)
 
         if not ignoreMissing:
             for f in evalFuncs:
@@ -1170,9 +1170,9 @@ class TransientProblem(TACSProblem):
         self._updateAssemblerVars()
 
         if evalFuncs is None:
-            evalFuncs = sorted(list(self.functionList))
+            evalFuncs = sorted(self.functionList)
         else:
-            evalFuncs = sorted(list(evalFuncs))
+            evalFuncs = sorted(evalFuncs)
 
         for f in evalFuncs:
             if f not in self.functionList:
@@ -1200,10 +1200,10 @@ class TransientProblem(TACSProblem):
             key = self.name + "_%s" % f
             # Finalize sensitivity arrays across all procs
             dvSens = self.integrator.getGradient(i)
-            dvSens.beginSetValues()
-            dvSens.endSetValues()
             xptSens = self.integrator.getXptGradient(i)
+            dvSens.beginSetValues()
             xptSens.beginSetValues()
+            dvSens.endSetValues()
             xptSens.endSetValues()
             # Return sensitivities as array in sens dict
             funcsSens[key] = {
@@ -31,12 +31,8 @@ class BaseUI:
 
         # Process the default options which are added to self.options
         # under the 'defaults' key. Make sure the key are lower case
-        self.options = {}
-        def_keys = self.defaultOptions.keys()
-        self.options["defaults"] = {}
-        for key in def_keys:
-            self.options["defaults"][key.lower()] = self.defaultOptions[key]
-            self.options[key.lower()] = self.defaultOptions[key]
+        defOptions = self._getLowerDefaultOptions()
+        self.options = {"defaults": defOptions, **defOptions}
 
         # Process the user-supplied options
         userOptions = options if options is not None else {}
@@ -44,6 +40,22 @@ class BaseUI:
         for key in optKeys:
             self.setOption(key, userOptions[key])
 
+    @classmethod
+    def _getLowerDefaultOptions(cls):
+        """
+        Return the default options of this class keyed by lower case name.
+        The dictionary is only built once per class and is shared by all
+        instances, so it should never be modified.
+        """
+        # Check the class' own dict so subclasses don't use their parent's copy
+        defOptions = cls.__dict__.get("_lowerDefaultOptions")
+        if defOptions is None:
+            defOptions = {
+                key.lower(): value for key, value in cls.defaultOptions.items()
+            }
+            cls._lowerDefaultOptions = defOptions
+        return defOptions
+
     def setOption(self, name, value):
         """
         Set a solver option value. The name is not case sensitive.
@@ -194,6 +194,187 @@ class PyTACSTestCase:
                                     atol=self.atol,
                                 )
 
+        def test_sv_sens_after_adjoint_products(self):
+            """
+            Test that numpy sv sens don't pick up values left by adjoint products
+            """
+            # Initial solve
+            self.run_solve()
+
+            np.random.seed(1)
+            for prob in self.tacs_probs:
+                if not isinstance(prob, problems.StaticProblem):
+                    continue
+                func_list = prob.getFunctionKeys()
+                if len(func_list) == 0:
+                    continue
+                with self.subTest(problem=prob.name):
+                    nvars = prob.getNumVariables()
+                    adjoints = [
+                        np.random.rand(nvars).astype(self.dtype) for _ in func_list
+                    ]
+                    dvSens = [
+                        np.zeros_like(self.dv0, dtype=self.dtype) for _ in func_list
+                    ]
+                    prob.addAdjointResProducts(adjoints, dvSens)
+                    xptSens = [
+                        np.zeros_like(self.xpts0, dtype=self.dtype) for _ in func_list
+                    ]
+                    prob.addAdjointResXptSensProducts(adjoints, xptSens)
+
+                    dIdus = [np.zeros(nvars, dtype=self.dtype) for _ in func_list]
+                    prob.addSVSens(func_list, dIdus)
+
+                    # Compare against sensitivities computed in fresh vectors
+                    dIduRefs = [
+                        self.fea_assembler.createVec(asBVec=True) for _ in func_list
+                    ]
+                    prob.addSVSens(func_list, dIduRefs)
+
+                    for func_name, dIdu, dIduRef in zip(func_list, dIdus, dIduRefs):
+                        with self.subTest(function=func_name):
+                            np.testing.assert_allclose(
+                                dIdu,
+                                dIduRef.getArray(),
+                                rtol=self.rtol,
+                                atol=self.atol,
+                            )
+
+        def test_adjoint_products_keep_adjoint(self):
+            """
+            Test that the adjoint residual products don't modify a user's adjoint BVec
+            """
+            # Initial solve
+            self.run_solve()
+
+            np.random.seed(1)
+            for prob in self.tacs_probs:
+                if not isinstance(prob, problems.StaticProblem):
+                    continue
+                with self.subTest(problem=prob.name):
+                    # Random adjoint, including the entries on BC dofs
+                    adjoint = self.fea_assembler.createVec(asBVec=True)
+                    adjoint.getArray()[:] = np.random.rand(prob.getNumVariables())
+                    adjoint0 = adjoint.getArray().copy()
+
+                    dvSens = np.zeros_like(self.dv0, dtype=self.dtype)
+                    prob.addAdjointResProducts([adjoint], [dvSens])
+                    np.testing.assert_array_equal(adjoint.getArray(), adjoint0)
+
+                    xptSens = np.zeros_like(self.xpts0, dtype=self.dtype)
+                    prob.addAdjointResXptSensProducts([adjoint], [xptSens])
+                    np.testing.assert_array_equal(adjoint.getArray(), adjoint0)
+
+        def test_batched_adjoint(self):
+            """
+            Test that the batched adjoint solve matches the per-function adjoint solves
+            """
+            # Initial solve
+            self.run_solve()
+
+            for prob in self.tacs_probs:
+                if not isinstance(prob, problems.StaticProblem):
+                    continue
+                func_list = prob.getFunctionKeys()
+                if len(func_list) == 0:
+                    continue
+                with self.subTest(problem=prob.name):
+                    nvars = prob.getNumVariables()
+                    dIdus = [np.zeros(nvars, dtype=self.dtype) for _ in func_list]
+                    prob.addSVSens(func_list, dIdus)
+
+                    # Solve each adjoint separately
+                    phis = [np.zeros(nvars, dtype=self.dtype) for _ in func_list]
+                    for dIdu, phi in zip(dIdus, phis):
+                        prob.solveAdjoint(dIdu, phi)
+
+                    # Solve all adjoints together
+                    phisBatched = [np.zeros(nvars, dtype=self.dtype) for _ in func_list]
+                    prob.solveAdjointBatched(dIdus, phisBatched)
+
+                    for func_name, phi, phiBatched in zip(func_list, phis, phisBatched):
+                        with self.subTest(function=func_name):
+                            np.testing.assert_allclose(
+                                phiBatched, phi, rtol=self.rtol, atol=self.atol
+                            )
+
+        def test_adjoint_initial_guess(self):
+            """
+            Test that the adjoint solution doesn't depend on the incoming adjoint values
+            """
+            # Initial solve
+            self.run_solve()
+
+            np.random.seed(1)
+            for prob in self.tacs_probs:
+                if not isinstance(prob, problems.StaticProblem):
+                    continue
+                func_list = prob.getFunctionKeys()
+                if len(func_list) == 0:
+                    continue
+                with self.subTest(problem=prob.name):
+                    nvars = prob.getNumVariables()
+                    dIdus = [np.zeros(nvars, dtype=self.dtype) for _ in func_list]
+                    prob.addSVSens(func_list, dIdus)
+
+                    for func_name, dIdu in zip(func_list, dIdus):
+                        with self.subTest(function=func_name):
+                            # Solve from a zero adjoint
+                            phi = np.zeros(nvars, dtype=self.dtype)
+                            prob.solveAdjoint(dIdu, phi)
+
+                            # Solve again from a random adjoint
+                            phiRand = np.random.rand(nvars).astype(self.dtype)
+                            prob.solveAdjoint(dIdu, phiRand)
+
+                            np.testing.assert_allclose(
+                                phiRand, phi, rtol=self.rtol, atol=self.atol
+                            )
+
+        def test_readonly_variables(self):
+            """
+            Test that the read-only state view can't be written to and tracks the states
+            """
+            # Initial solve
+            self.run_solve()
+
+            for prob in self.tacs_probs:
+                if not isinstance(prob, problems.StaticProblem):
+                    continue
+                with self.subTest(problem=prob.name):
+                    u = prob.getVariables(readonly=True)
+                    self.assertFalse(u.flags.writeable)
+                    with self.assertRaises(ValueError):
+                        u[:] = 0.0
+                    np.testing.assert_array_equal(u, prob.getVariables())
+
+                    # The view should follow any change to the states, setVariables
+                    # resets the BC entries so compare against the stored states
+                    prob.setVariables(2.0 * prob.getVariables())
+                    np.testing.assert_array_equal(u, prob.getVariables())
+
+        def test_residual_after_load_change(self):
+            """
+            Test that the residual is converged after the loads change between solves
+            """
+            res = self.fea_assembler.createVec(asBVec=True)
+            for prob in self.tacs_probs:
+                if not isinstance(prob, problems.StaticProblem):
+                    continue
+                with self.subTest(problem=prob.name):
+                    prob.solve()
+
+                    # Change the loads, the old states should no longer be converged
+                    prob.addLoadToRHS(np.ones(prob.getNumVariables(), dtype=self.dtype))
+                    prob.getResidual(res)
+                    res0 = np.real(res.norm())
+                    self.assertGreater(res0, 0.0)
+
+                    # Re-solve with the new loads
+                    prob.solve()
+                    prob.getResidual(res)
+                    self.assertLess(np.real(res.norm()), 1e-6 * res0)
+
         def test_write_solution(self):
             """
             Test f5 solution writing procedure